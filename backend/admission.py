@@ -0,0 +1,151 @@
+# admission.py
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Dict, Optional
+
+from starlette.responses import JSONResponse
+
+
+class Lane:
+    """
+    A priority lane: a concurrency limit plus a bounded wait queue.
+    max_concurrent=None means the lane is never limited (cheap endpoints).
+    """
+
+    def __init__(self, max_concurrent: Optional[int] = None, max_queue: int = 0,
+                 queue_timeout: float = 10.0):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        # Futures of queued requests, FIFO; release() hands a slot to the first one
+        self._waiters = deque()
+
+        # --- Metrics ---
+        self.in_flight = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.admitted = 0
+        self.rejected_queue_full = 0
+        self.rejected_timeout = 0
+        self.avg_service_seconds = 0.0  # exponentially weighted
+
+    def retry_after(self) -> int:
+        """Rough seconds until a queued slot would free up."""
+        if not self.max_concurrent:
+            return 1
+        waves = (self.queued + 1) / self.max_concurrent
+        return max(1, math.ceil(waves * (self.avg_service_seconds or 1.0)))
+
+    async def acquire(self) -> Optional[int]:
+        """Returns None when admitted, otherwise the HTTP status to reject with."""
+        # Admission is decided synchronously from the counters, before any await,
+        # so a burst arriving in the same event-loop tick can't overfill the queue.
+        if not self.max_concurrent or (self.in_flight < self.max_concurrent and not self._waiters):
+            self.in_flight += 1
+            self.admitted += 1
+            return None
+        if self.queued >= self.max_queue:
+            self.rejected_queue_full += 1
+            return 429
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.queued += 1
+        self.max_queued = max(self.max_queued, self.queued)
+        try:
+            await asyncio.wait({waiter}, timeout=self.queue_timeout)
+        except asyncio.CancelledError:
+            # Client went away while queued; give back a slot it may just have been handed
+            if waiter.done() and not waiter.cancelled():
+                self.release(0.0, measured=False)
+            else:
+                self._waiters.remove(waiter)
+                waiter.cancel()
+            raise
+        finally:
+            self.queued -= 1
+
+        if not waiter.done():
+            self._waiters.remove(waiter)
+            waiter.cancel()
+            self.rejected_timeout += 1
+            return 503
+        # release() already counted this slot in in_flight
+        self.admitted += 1
+        return None
+
+    def release(self, service_seconds: float, measured: bool = True) -> None:
+        if measured:
+            self.avg_service_seconds = 0.8 * self.avg_service_seconds + 0.2 * service_seconds
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)  # the slot passes straight to the next in line
+                return
+        self.in_flight -= 1
+
+    def metrics(self) -> dict:
+        return {
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "admitted": self.admitted,
+            "rejected_queue_full": self.rejected_queue_full,
+            "rejected_timeout": self.rejected_timeout,
+            "avg_service_seconds": round(self.avg_service_seconds, 3),
+        }
+
+
+class AdmissionController:
+    """Maps request paths to lanes. Paths without a lane are always admitted."""
+
+    def __init__(self, lanes: Dict[str, Lane], routes: Dict[str, str]):
+        unknown = set(routes.values()) - set(lanes)
+        if unknown:
+            raise ValueError(f"Routes refer to undefined lanes: {sorted(unknown)}")
+        self.lanes = lanes
+        self.routes = routes
+
+    def lane_for(self, path: str) -> Optional[Lane]:
+        name = self.routes.get(path)
+        return self.lanes[name] if name else None
+
+    def metrics(self) -> dict:
+        return {name: lane.metrics() for name, lane in self.lanes.items()}
+
+
+class AdmissionMiddleware:
+    """
+    ASGI middleware that sheds load before an expensive endpoint starts work.
+    Full queue -> 429, waited too long in the queue -> 503, both with Retry-After.
+    """
+
+    def __init__(self, app, controller: AdmissionController):
+        self.app = app
+        self.controller = controller
+
+    async def __call__(self, scope, receive, send):
+        lane = self.controller.lane_for(scope["path"]) if scope["type"] == "http" else None
+        if lane is None:
+            await self.app(scope, receive, send)
+            return
+
+        rejected = await lane.acquire()
+        if rejected is not None:
+            response = JSONResponse(
+                {"detail": "Server is busy, please try again shortly."},
+                status_code=rejected,
+                headers={"Retry-After": str(lane.retry_after())},
+            )
+            await response(scope, receive, send)
+            return
+
+        started = time.monotonic()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            lane.release(time.monotonic() - started)
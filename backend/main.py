@@ -1,14 +1,47 @@
 # main.py
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 # 1. Import the new router along with the others
 from routers import authentication, recommendation, disease_prediction, fertilizer_recommendation # <-- ADDED
+import providers
+from admission import AdmissionController, AdmissionMiddleware, Lane
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Optional: keep weather/soil for the busiest farm locations warm in the cache
+    providers.start_warmer()
+    yield
+    # Stop the cache warmer and close the shared HTTP client used by the providers
+    await providers.close()
 
 app = FastAPI(
     title="AgroPath API",
     description="API for crop recommendation, disease prediction, and user auth.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
+)
+
+# Admission control: expensive endpoints get their own lane with a concurrency
+# limit and a bounded queue, so a burst of image uploads can't starve cheap
+# endpoints like /login, / or fertilizer-by-crop (these stay in the unlimited lane).
+admission_controller = AdmissionController(
+    lanes={
+        "inference": Lane(max_concurrent=2, max_queue=8, queue_timeout=10.0),
+        "location": Lane(max_concurrent=16, max_queue=64, queue_timeout=15.0),
+        "cheap": Lane(),
+    },
+    routes={
+        "/predict-disease": "inference",
+        "/predict_from_location": "location",
+        "/recommend/fertilizer_from_location": "location",
+        "/login": "cheap",
+        "/": "cheap",
+        "/recommend/fertilizer_by_crop": "cheap",
+    },
 )
+# Added before CORS so that CORS wraps it and rejections still carry CORS headers
+app.add_middleware(AdmissionMiddleware, controller=admission_controller)
 
 # CORS Middleware (no change)
 origins = ["*"]
@@ -29,3 +62,12 @@ app.include_router(fertilizer_recommendation.router) # 2. Add the new router to
 @app.get("/")
 def read_root():
     return {"message": "Welcome to the AgroPath API"}
+
+@app.get("/metrics/admission")
+def admission_metrics():
+    return admission_controller.metrics()
+
+@app.get("/metrics/cache-warmer")
+def cache_warmer_metrics():
+    warmer = providers.get_warmer()
+    return warmer.status() if warmer else {"running": False}
@@ -0,0 +1,14 @@
+# providers/__init__.py
+from .base import (
+    EnvironmentalProvider, EnvironmentalData, Reading, Weather,
+    DEFAULTS, LIVE, CACHED, LOCAL, STUB, DEFAULT,
+)
+from .cached import CachedProvider, tile_key
+from .live import LiveProvider
+from .local import LocalRasterProvider, DistrictSoilTable, normalize_district
+from .stub import StubProvider
+from .warmer import CacheWarmer, TileTracker, RateBudget
+from .service import (
+    EnvironmentalDataService, get_service, get_environmental_data,
+    start_warmer, get_warmer, close,
+)
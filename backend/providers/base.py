@@ -0,0 +1,68 @@
+# providers/base.py
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+# --- Where a value came from ---
+LIVE = "live"        # fetched from OpenWeatherMap / SoilGrids for this request
+CACHED = "cached"    # served from the in-process tile cache
+LOCAL = "local"      # read from a file on disk (soil raster, district CSV)
+STUB = "stub"        # fixed values from StubProvider (offline / testing)
+DEFAULT = "default"  # nobody answered before the deadline, fallback used
+
+# Fallback values (same numbers the routers used to hard-code)
+DEFAULTS = {
+    "temperature": 28.0,
+    "humidity": 60.0,
+    "rainfall": 100.0,
+    "nitrogen": 40.0,
+    "ph": 7.0,
+    "phosphorus": 45.0,
+    "potassium": 45.0,
+}
+
+
+@dataclass(frozen=True)
+class Reading:
+    """A single provider answer together with its source."""
+    value: Any
+    source: str
+
+
+@dataclass(frozen=True)
+class Weather:
+    temperature: float
+    humidity: float
+    rainfall: float
+
+
+@dataclass
+class EnvironmentalData:
+    """Everything the crop/fertilizer models need for one location."""
+    temperature: float
+    humidity: float
+    rainfall: float
+    nitrogen: float
+    phosphorus: float
+    potassium: float
+    ph: float
+    sources: Dict[str, str] = field(default_factory=dict)
+
+
+class EnvironmentalProvider:
+    """
+    Base class for pluggable weather/soil providers.
+    Each method returns a Reading, or None if this provider has no answer
+    (the service then asks the next provider in the chain).
+    """
+
+    async def weather(self, lat: float, lon: float) -> Optional[Reading]:
+        return None
+
+    async def nitrogen(self, lat: float, lon: float) -> Optional[Reading]:
+        return None
+
+    async def ph(self, lat: float, lon: float) -> Optional[Reading]:
+        return None
+
+    async def aclose(self) -> None:
+        pass
@@ -0,0 +1,110 @@
+# providers/cached.py
+import asyncio
+import time
+from typing import Dict, Optional, Tuple
+
+from .base import EnvironmentalProvider, Reading, CACHED
+
+
+def tile_key(lat: float, lon: float, precision: int = 2) -> Tuple[float, float]:
+    """Rounds coordinates to a tile (2 decimals is roughly 1 km)."""
+    return (round(lat, precision), round(lon, precision))
+
+
+class CachedProvider(EnvironmentalProvider):
+    """
+    Wraps another provider with a per-tile TTL cache.
+    Weather goes stale quickly; soil properties practically never change.
+    """
+
+    def __init__(self, inner: EnvironmentalProvider, weather_ttl: float = 1800.0,
+                 soil_ttl: float = 7 * 24 * 3600.0, precision: int = 2, max_entries: int = 10000):
+        self.inner = inner
+        self.ttls = {"weather": weather_ttl, "nitrogen": soil_ttl, "ph": soil_ttl}
+        self.precision = precision
+        self.max_entries = max_entries
+        # (kind, tile) -> (expires_at, value)
+        self._entries: Dict[tuple, Tuple[float, object]] = {}
+        # (kind, tile) -> upstream fetch still running, shared by concurrent misses
+        self._inflight: Dict[tuple, asyncio.Task] = {}
+
+    def _key(self, kind: str, lat: float, lon: float) -> tuple:
+        return (kind, tile_key(lat, lon, self.precision))
+
+    def get(self, kind: str, lat: float, lon: float) -> Optional[Reading]:
+        entry = self._entries.get(self._key(kind, lat, lon))
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return Reading(entry[1], CACHED)
+
+    def put(self, kind: str, lat: float, lon: float, value) -> None:
+        if len(self._entries) >= self.max_entries:
+            self._evict()
+        expires_at = time.monotonic() + self.ttls[kind]
+        self._entries[self._key(kind, lat, lon)] = (expires_at, value)
+
+    def expires_in(self, kind: str, lat: float, lon: float) -> Optional[float]:
+        """Seconds until the cached value expires, or None if not cached."""
+        entry = self._entries.get(self._key(kind, lat, lon))
+        if entry is None:
+            return None
+        return entry[0] - time.monotonic()
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
+        # Still full: drop the oldest insertions
+        while len(self._entries) >= self.max_entries:
+            del self._entries[next(iter(self._entries))]
+
+    async def _fill(self, kind: str, lat: float, lon: float) -> Optional[Reading]:
+        reading = await getattr(self.inner, kind)(lat, lon)
+        if reading is not None:
+            self.put(kind, lat, lon, reading.value)
+        return reading
+
+    def _fill_done(self, key: tuple, task: asyncio.Task) -> None:
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is not None:
+            # Nobody may be awaiting any more (caller hit its deadline), so log it here
+            print(f"--- CACHE FILL {key} FAILED ---\nError: {task.exception()}")
+
+    def is_filling(self, kind: str, lat: float, lon: float) -> bool:
+        return self._key(kind, lat, lon) in self._inflight
+
+    async def refresh(self, kind: str, lat: float, lon: float) -> Optional[Reading]:
+        """
+        Fetches from the inner provider into the cache, ignoring the TTL.
+        Joins an upstream call already in flight for the same tile instead of
+        starting another, so requests and the cache warmer share one call.
+        """
+        key = self._key(kind, lat, lon)
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._fill(kind, lat, lon))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._fill_done(key, t))
+        # Shielded: if the caller's deadline passes, the upstream call keeps
+        # running and still fills the cache for the next request.
+        return await asyncio.shield(task)
+
+    async def _fetch(self, kind: str, lat: float, lon: float) -> Optional[Reading]:
+        cached = self.get(kind, lat, lon)
+        if cached is not None:
+            return cached
+        return await self.refresh(kind, lat, lon)
+
+    async def weather(self, lat: float, lon: float) -> Optional[Reading]:
+        return await self._fetch("weather", lat, lon)
+
+    async def nitrogen(self, lat: float, lon: float) -> Optional[Reading]:
+        return await self._fetch("nitrogen", lat, lon)
+
+    async def ph(self, lat: float, lon: float) -> Optional[Reading]:
+        return await self._fetch("ph", lat, lon)
+
+    async def aclose(self) -> None:
+        for task in list(self._inflight.values()):
+            task.cancel()
+        await self.inner.aclose()
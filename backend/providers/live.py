@@ -0,0 +1,66 @@
+# providers/live.py
+import os
+from typing import Optional
+
+import httpx
+
+from .base import EnvironmentalProvider, Reading, Weather, LIVE
+
+WEATHER_API_KEY = os.getenv("OPENWEATHER_API_KEY", "d9c25f037b42454a7940d18aaec416ac")
+WEATHER_URL = "http://api.openweathermap.org/data/2.5/weather"
+SOILGRIDS_URL = "https://rest.isric.org/soilgrids/v2.0/properties/query"
+
+
+class LiveProvider(EnvironmentalProvider):
+    """Calls OpenWeatherMap and SoilGrids over one shared, pooled HTTP client."""
+
+    def __init__(self, api_key: str = WEATHER_API_KEY, timeout: float = 60.0):
+        self.api_key = api_key
+        self.timeout = timeout
+        self._client: Optional[httpx.AsyncClient] = None
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        # Created lazily so it binds to the running event loop
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=self.timeout)
+        return self._client
+
+    async def weather(self, lat: float, lon: float) -> Optional[Reading]:
+        params = {"lat": lat, "lon": lon, "appid": self.api_key, "units": "metric"}
+        response = await self.client.get(WEATHER_URL, params=params)
+        response.raise_for_status()
+        data = response.json()
+        weather = Weather(
+            temperature=float(data["main"]["temp"]),
+            humidity=float(data["main"]["humidity"]),
+            rainfall=float(data.get("rain", {}).get("1h", 100)),
+        )
+        return Reading(weather, LIVE)
+
+    async def _soil_mean(self, lat: float, lon: float, prop: str):
+        params = {"lon": lon, "lat": lat, "property": prop, "depth": "0-5cm", "value": "mean"}
+        response = await self.client.get(SOILGRIDS_URL, params=params)
+        response.raise_for_status()
+        try:
+            return response.json()["properties"]["layers"][0]["depths"][0]["values"]["mean"]
+        except (KeyError, IndexError, TypeError):
+            print(f"⚠️ Could not parse '{prop}' from SoilGrids response.")
+            return None
+
+    async def nitrogen(self, lat: float, lon: float) -> Optional[Reading]:
+        mean = await self._soil_mean(lat, lon, "nitrogen")
+        if mean is None:
+            return None
+        return Reading(float(mean) * 2.24, LIVE)  # Unit conversion to kg/ha
+
+    async def ph(self, lat: float, lon: float) -> Optional[Reading]:
+        mean = await self._soil_mean(lat, lon, "phh2o")
+        if mean is None:
+            return None
+        return Reading(float(mean) / 10.0, LIVE)  # SoilGrids reports pH x 10
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
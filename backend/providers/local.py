@@ -0,0 +1,79 @@
+# providers/local.py
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from .base import EnvironmentalProvider, Reading, LOCAL
+
+
+def normalize_district(name: str) -> str:
+    """Cleans and standardizes the district name."""
+    name = str(name).lower().replace(" division", "").strip()
+    mapping = {"allahabad": "prayagraj"}
+    return mapping.get(name, name)
+
+
+class LocalRasterProvider(EnvironmentalProvider):
+    """
+    Serves nitrogen and pH from a local soil grid exported from SoilGrids,
+    stored as a CSV with columns: lat, lon, nitrogen (kg/ha), ph.
+    Answers with the nearest cell, if it lies within `max_distance` degrees.
+    """
+
+    def __init__(self, path: str = os.getenv("SOIL_RASTER_PATH", "data/soil_raster.csv"),
+                 max_distance: float = 0.1):
+        self.path = path
+        self.max_distance = max_distance
+        self.grid = None
+        if os.path.exists(path):
+            try:
+                df = pd.read_csv(path)
+                self.grid = {
+                    "coords": df[["lat", "lon"]].to_numpy(dtype=float),
+                    "nitrogen": df["nitrogen"].to_numpy(dtype=float),
+                    "ph": df["ph"].to_numpy(dtype=float),
+                }
+                print(f"✅ Local soil raster loaded: {len(df)} cells.")
+            except Exception as e:
+                print(f"⚠️ Could not load soil raster '{path}': {e}")
+
+    def _lookup(self, prop: str, lat: float, lon: float) -> Optional[Reading]:
+        if self.grid is None:
+            return None
+        distances = np.abs(self.grid["coords"] - (lat, lon)).max(axis=1)
+        nearest = int(distances.argmin())
+        if distances[nearest] > self.max_distance:
+            return None
+        return Reading(float(self.grid[prop][nearest]), LOCAL)
+
+    async def nitrogen(self, lat: float, lon: float) -> Optional[Reading]:
+        return self._lookup("nitrogen", lat, lon)
+
+    async def ph(self, lat: float, lon: float) -> Optional[Reading]:
+        return self._lookup("ph", lat, lon)
+
+
+class DistrictSoilTable:
+    """Phosphorus and potassium per district, from the local soil_data.csv."""
+
+    def __init__(self, path: str = "soil_data.csv"):
+        self.path = path
+        self.rows = {}
+        self.loaded = False
+        try:
+            df = pd.read_csv(path)
+            for _, row in df.iterrows():
+                self.rows[normalize_district(row["DISTRICT"])] = (float(row["P"]), float(row["K"]))
+            self.loaded = True
+        except FileNotFoundError:
+            print(f"⚠️ FATAL ERROR: '{path}' not found.")
+        except Exception as e:
+            print(f"⚠️ FATAL WARNING: Could not load district soil data: {e}")
+
+    def lookup(self, district: str) -> Optional[Reading]:
+        values = self.rows.get(normalize_district(district))
+        if values is None:
+            return None
+        return Reading(values, LOCAL)
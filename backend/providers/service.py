@@ -0,0 +1,161 @@
+# providers/service.py
+import asyncio
+import os
+from typing import List, Optional
+
+from .base import EnvironmentalProvider, EnvironmentalData, Reading, DEFAULTS, DEFAULT
+from .cached import CachedProvider
+from .live import LiveProvider
+from .local import LocalRasterProvider, DistrictSoilTable
+from .stub import StubProvider
+from .warmer import CacheWarmer, TileTracker, WARMER_ENABLED
+
+# Total time budget for one location lookup (weather + soil + district together).
+# Values still missing at the deadline are defaulted for this request.
+DEADLINE_SECONDS = float(os.getenv("ENV_DATA_DEADLINE_SECONDS", "20"))
+# How long a single upstream call may run. With the 'cached' provider, calls that
+# outlive the deadline keep going in the background and fill the cache.
+UPSTREAM_TIMEOUT_SECONDS = max(DEADLINE_SECONDS, float(os.getenv("ENV_DATA_UPSTREAM_TIMEOUT_SECONDS", "60")))
+# Provider chain, tried in order for each value: live, cached, raster, stub
+PROVIDERS = os.getenv("ENV_DATA_PROVIDERS", "cached,raster")
+
+
+class EnvironmentalDataService:
+    """
+    Fans out the weather, nitrogen, pH and district lookups concurrently
+    under a single deadline. Each value is taken from the first provider
+    in the chain that answers; anything still missing gets a default.
+    Every provider but the last only gets an equal share of the deadline,
+    so a hanging upstream can't keep a later (local) provider from answering.
+    """
+
+    def __init__(self, providers: List[EnvironmentalProvider], districts: DistrictSoilTable,
+                 deadline: float = DEADLINE_SECONDS):
+        self.providers = providers
+        self.districts = districts
+        self.deadline = deadline
+        # Set by start_warmer() to record which tiles are being requested
+        self.tracker: Optional[TileTracker] = None
+
+    @property
+    def cache(self) -> Optional[CachedProvider]:
+        for provider in self.providers:
+            if isinstance(provider, CachedProvider):
+                return provider
+        return None
+
+    async def first_reading(self, kind: str, lat: float, lon: float) -> Optional[Reading]:
+        share = self.deadline / max(1, len(self.providers))
+        for i, provider in enumerate(self.providers):
+            is_last = i == len(self.providers) - 1
+            try:
+                call = getattr(provider, kind)(lat, lon)
+                # The last provider runs until the overall deadline in fetch() cancels it
+                reading = await (call if is_last else asyncio.wait_for(call, timeout=share))
+            except asyncio.TimeoutError:
+                print(f"--- {type(provider).__name__}.{kind} too slow ({share:.2f}s), trying next provider ---")
+                continue
+            except Exception as e:
+                print(f"--- {type(provider).__name__}.{kind} FAILED ---\nError: {e}")
+                continue
+            if reading is not None:
+                return reading
+        return None
+
+    async def _district(self, district: str) -> Optional[Reading]:
+        return self.districts.lookup(district)
+
+    async def fetch(self, lat: float, lon: float, district: str) -> EnvironmentalData:
+        if self.tracker is not None:
+            self.tracker.record(lat, lon)
+        tasks = {
+            "weather": asyncio.create_task(self.first_reading("weather", lat, lon)),
+            "nitrogen": asyncio.create_task(self.first_reading("nitrogen", lat, lon)),
+            "ph": asyncio.create_task(self.first_reading("ph", lat, lon)),
+            "district": asyncio.create_task(self._district(district)),
+        }
+        done, pending = await asyncio.wait(tasks.values(), timeout=self.deadline)
+        for task in pending:
+            task.cancel()
+        if pending:
+            print(f"⚠️ Environmental data deadline ({self.deadline}s) hit, using defaults for the rest.")
+
+        readings = {name: task.result() if task in done else None for name, task in tasks.items()}
+        values, sources = dict(DEFAULTS), {name: DEFAULT for name in DEFAULTS}
+
+        weather = readings["weather"]
+        if weather is not None:
+            for name in ("temperature", "humidity", "rainfall"):
+                values[name] = getattr(weather.value, name)
+                sources[name] = weather.source
+        for name in ("nitrogen", "ph"):
+            if readings[name] is not None:
+                values[name] = readings[name].value
+                sources[name] = readings[name].source
+        district_reading = readings["district"]
+        if district_reading is not None:
+            values["phosphorus"], values["potassium"] = district_reading.value
+            sources["phosphorus"] = sources["potassium"] = district_reading.source
+
+        return EnvironmentalData(**values, sources=sources)
+
+    async def aclose(self) -> None:
+        for provider in self.providers:
+            await provider.aclose()
+
+
+def build_provider(name: str) -> EnvironmentalProvider:
+    name = name.strip().lower()
+    if name == "live":
+        return LiveProvider(timeout=UPSTREAM_TIMEOUT_SECONDS)
+    if name == "cached":
+        return CachedProvider(LiveProvider(timeout=UPSTREAM_TIMEOUT_SECONDS))
+    if name == "raster":
+        return LocalRasterProvider()
+    if name == "stub":
+        return StubProvider()
+    raise ValueError(f"Unknown environmental data provider: '{name}'")
+
+
+_service: Optional[EnvironmentalDataService] = None
+_warmer: Optional[CacheWarmer] = None
+
+
+def get_service() -> EnvironmentalDataService:
+    global _service
+    if _service is None:
+        providers = [build_provider(name) for name in PROVIDERS.split(",") if name.strip()]
+        _service = EnvironmentalDataService(providers, DistrictSoilTable())
+    return _service
+
+
+async def get_environmental_data(lat: float, lon: float, district: str) -> EnvironmentalData:
+    return await get_service().fetch(lat, lon, district)
+
+
+def start_warmer() -> Optional[CacheWarmer]:
+    """Starts the background cache warmer if CACHE_WARMER_ENABLED=1."""
+    global _warmer
+    if not WARMER_ENABLED or _warmer is not None:
+        return _warmer
+    service = get_service()
+    if service.cache is None:
+        print("⚠️ Cache warmer enabled but no 'cached' provider is configured; not starting.")
+        return None
+    service.tracker = TileTracker(precision=service.cache.precision)
+    _warmer = CacheWarmer(service.cache, service.tracker)
+    _warmer.start()
+    return _warmer
+
+
+def get_warmer() -> Optional[CacheWarmer]:
+    return _warmer
+
+
+async def close() -> None:
+    global _warmer
+    if _warmer is not None:
+        await _warmer.stop()
+        _warmer = None
+    if _service is not None:
+        await _service.aclose()
@@ -0,0 +1,25 @@
+# providers/stub.py
+from typing import Optional
+
+from .base import EnvironmentalProvider, Reading, Weather, DEFAULTS, STUB
+
+
+class StubProvider(EnvironmentalProvider):
+    """Fixed values for offline development and tests. No network access."""
+
+    def __init__(self, **overrides):
+        self.values = {**DEFAULTS, **overrides}
+
+    async def weather(self, lat: float, lon: float) -> Optional[Reading]:
+        weather = Weather(
+            temperature=self.values["temperature"],
+            humidity=self.values["humidity"],
+            rainfall=self.values["rainfall"],
+        )
+        return Reading(weather, STUB)
+
+    async def nitrogen(self, lat: float, lon: float) -> Optional[Reading]:
+        return Reading(self.values["nitrogen"], STUB)
+
+    async def ph(self, lat: float, lon: float) -> Optional[Reading]:
+        return Reading(self.values["ph"], STUB)
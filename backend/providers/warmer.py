@@ -0,0 +1,183 @@
+# providers/warmer.py
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .cached import CachedProvider, tile_key
+
+WARMER_ENABLED = os.getenv("CACHE_WARMER_ENABLED", "0") == "1"
+INTERVAL_SECONDS = float(os.getenv("CACHE_WARMER_INTERVAL_SECONDS", "60"))
+TOP_TILES = int(os.getenv("CACHE_WARMER_TOP_TILES", "50"))
+CALLS_PER_MINUTE = float(os.getenv("CACHE_WARMER_CALLS_PER_MINUTE", "30"))
+REFRESH_AHEAD_SECONDS = float(os.getenv("CACHE_WARMER_REFRESH_AHEAD_SECONDS", "300"))
+# After a failed/empty soil lookup (water, cities, SoilGrids outage), wait this long before retrying
+SOIL_RETRY_SECONDS = float(os.getenv("CACHE_WARMER_SOIL_RETRY_SECONDS", str(6 * 3600)))
+
+
+class TileTracker:
+    """
+    Remembers which coordinate tiles were requested recently, with a decayed
+    hit count so yesterday's morning traffic still ranks high today.
+    """
+
+    def __init__(self, precision: int = 2, half_life: float = 24 * 3600.0,
+                 window: float = 3 * 24 * 3600.0, max_tiles: int = 5000):
+        self.precision = precision
+        self.half_life = half_life
+        self.window = window
+        self.max_tiles = max_tiles
+        # tile -> (score, last_seen)
+        self.tiles: Dict[Tuple[float, float], Tuple[float, float]] = {}
+
+    def _decayed(self, score: float, last_seen: float, now: float) -> float:
+        return score * 0.5 ** ((now - last_seen) / self.half_life)
+
+    def record(self, lat: float, lon: float) -> None:
+        now = time.time()
+        tile = tile_key(lat, lon, self.precision)
+        score, last_seen = self.tiles.pop(tile, (0.0, now))
+        self.tiles[tile] = (self._decayed(score, last_seen, now) + 1.0, now)
+        if len(self.tiles) > self.max_tiles:
+            del self.tiles[next(iter(self.tiles))]  # least recently seen
+
+    def hottest(self, limit: int) -> List[Tuple[float, float]]:
+        now = time.time()
+        for tile in [t for t, (_, seen) in self.tiles.items() if now - seen > self.window]:
+            del self.tiles[tile]
+        ranked = sorted(self.tiles.items(), key=lambda item: self._decayed(*item[1], now), reverse=True)
+        return [tile for tile, _ in ranked[:limit]]
+
+
+class RateBudget:
+    """Token bucket limiting how many upstream calls the warmer may make. <= 0 means none."""
+
+    def __init__(self, calls_per_minute: float):
+        calls_per_minute = max(0.0, calls_per_minute)
+        self.capacity = max(1.0, calls_per_minute) if calls_per_minute else 0.0
+        self.rate = calls_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def try_take(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
+
+
+class CacheWarmer:
+    """
+    Background task that keeps the hottest tiles in the provider cache:
+    weather is refreshed shortly before it expires, soil values are fetched
+    once if missing. Upstream calls never exceed the rate budget, and weather
+    for every hot tile comes before any soil pre-population.
+    """
+
+    def __init__(self, cache: CachedProvider, tracker: TileTracker,
+                 interval: float = INTERVAL_SECONDS, top_tiles: int = TOP_TILES,
+                 calls_per_minute: float = CALLS_PER_MINUTE,
+                 refresh_ahead: float = REFRESH_AHEAD_SECONDS,
+                 soil_retry: float = SOIL_RETRY_SECONDS):
+        self.cache = cache
+        self.tracker = tracker
+        self.interval = interval
+        self.top_tiles = top_tiles
+        self.refresh_ahead = refresh_ahead
+        self.soil_retry = soil_retry
+        # (kind, tile) -> time.monotonic() before which a failed soil lookup isn't retried
+        self.soil_backoff: Dict[tuple, float] = {}
+        self.budget = RateBudget(calls_per_minute)
+        self._task: Optional[asyncio.Task] = None
+
+        # --- Status ---
+        self.cycles = 0
+        self.last_run: Optional[str] = None
+        self.calls_last_cycle = 0
+        self.budget_exhausted = 0
+        self.warmed = deque(maxlen=200)
+
+    def _needs_refresh(self, kind: str, lat: float, lon: float) -> bool:
+        remaining = self.cache.expires_in(kind, lat, lon)
+        return remaining is None or remaining < self.refresh_ahead
+
+    async def _warm(self, kind: str, lat: float, lon: float) -> bool:
+        """Fetches one value into the cache. Returns True if it got a value."""
+        try:
+            reading = await self.cache.refresh(kind, lat, lon)
+        except Exception as e:
+            print(f"--- CACHE WARMER: {kind} for ({lat}, {lon}) FAILED ---\nError: {e}")
+            return False
+        if reading is None:
+            return False
+        self.warmed.append({
+            "lat": lat, "lon": lon, "kind": kind,
+            "at": datetime.utcnow().isoformat(timespec="seconds"),
+        })
+        return True
+
+    async def warm_once(self) -> int:
+        """Runs one warming pass. Returns the number of upstream calls made."""
+        calls = 0
+        hot = self.tracker.hottest(self.top_tiles)
+        now = time.monotonic()
+        for key in [k for k, retry_at in self.soil_backoff.items() if retry_at <= now]:
+            del self.soil_backoff[key]
+
+        # Weather for every hot tile first, then soil with whatever budget is left
+        jobs = [("weather", tile) for tile in hot]
+        jobs += [(kind, tile) for tile in hot for kind in ("nitrogen", "ph")]
+        for kind, (lat, lon) in jobs:
+            if not self._needs_refresh(kind, lat, lon) or (kind, (lat, lon)) in self.soil_backoff:
+                continue
+            if self.cache.is_filling(kind, lat, lon):
+                continue  # a user request is already fetching it; don't spend budget twice
+            if not self.budget.try_take():
+                self.budget_exhausted += 1
+                return calls
+            calls += 1
+            if not await self._warm(kind, lat, lon) and kind != "weather":
+                self.soil_backoff[(kind, (lat, lon))] = time.monotonic() + self.soil_retry
+        return calls
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                self.calls_last_cycle = await self.warm_once()
+            except Exception as e:
+                print(f"⚠️ Cache warmer cycle failed: {e}")
+            self.cycles += 1
+            self.last_run = datetime.utcnow().isoformat(timespec="seconds")
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+            print("✅ Cache warmer started.")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def status(self) -> dict:
+        return {
+            "running": self._task is not None,
+            "cycles": self.cycles,
+            "last_run": self.last_run,
+            "tracked_tiles": len(self.tracker.tiles),
+            "calls_per_minute": self.budget.rate * 60.0,
+            "calls_last_cycle": self.calls_last_cycle,
+            "budget_exhausted": self.budget_exhausted,
+            "soil_backoff_entries": len(self.soil_backoff),
+            "recently_warmed": list(self.warmed),
+        }
@@ -2,12 +2,18 @@
 import tensorflow as tf
 import numpy as np
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from PIL import Image
 import io
 import json
+import threading
 
 router = APIRouter(tags=['Disease Prediction'])
 
+# Keras doesn't guarantee model.predict() is thread-safe, and the inference
+# lane lets more than one request into the threadpool at once.
+inference_lock = threading.Lock()
+
 # --- 1. LOAD THE TRAINED MODEL, CLASS NAMES, AND CURES DATA ---
 try:
     model = tf.keras.models.load_model('plant_disease_model.keras')
@@ -48,6 +54,11 @@ def preprocess_image(image_bytes: bytes):
         return None
 
 
+def run_inference(img_array):
+    with inference_lock:
+        return model.predict(img_array)
+
+
 # --- 3. THE PREDICTION ENDPOINT ---
 @router.post("/predict-disease")
 async def predict_disease(file: UploadFile = File(...)):
@@ -55,11 +66,13 @@ async def predict_disease(file: UploadFile = File(...)):
         raise HTTPException(status_code=503, detail="Server model is not configured. Check server logs.")
 
     image_bytes = await file.read()
-    processed_image = preprocess_image(image_bytes)
+    # Preprocessing and inference are CPU-bound; run them off the event loop
+    # so other endpoints keep responding while an image is being classified.
+    processed_image = await run_in_threadpool(preprocess_image, image_bytes)
     if processed_image is None:
         raise HTTPException(status_code=400, detail="Invalid or corrupt image file.")
 
-    predictions = model.predict(processed_image)
+    predictions = await run_in_threadpool(run_inference, processed_image)
     score = tf.nn.softmax(predictions[0])
     predicted_class = class_names[np.argmax(score)]
     confidence = 100 * np.max(score)
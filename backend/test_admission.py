@@ -0,0 +1,46 @@
+# test_admission.py
+import asyncio
+
+from admission import Lane
+
+
+def test_same_tick_burst_respects_queue_limit():
+    async def burst():
+        lane = Lane(max_concurrent=2, max_queue=2, queue_timeout=0.05)
+        results = await asyncio.gather(*(lane.acquire() for _ in range(20)))
+        return lane, results
+
+    lane, results = asyncio.run(burst())
+    assert results.count(None) == 2    # two slots taken straight away
+    assert results.count(503) == 2     # two queued, timed out waiting
+    assert results.count(429) == 16    # the rest shed immediately
+    assert lane.max_queued == 2
+    assert lane.in_flight == 2
+    assert lane.queued == 0
+
+
+def test_release_hands_slot_to_queued_request():
+    async def scenario():
+        lane = Lane(max_concurrent=1, max_queue=1, queue_timeout=1.0)
+        assert await lane.acquire() is None
+        queued = asyncio.create_task(lane.acquire())
+        await asyncio.sleep(0)
+        assert lane.queued == 1
+        lane.release(0.01)
+        assert await queued is None
+        return lane
+
+    lane = asyncio.run(scenario())
+    assert lane.in_flight == 1
+    assert lane.admitted == 2
+    assert lane.queued == 0
+
+
+def test_unlimited_lane_never_queues():
+    async def burst():
+        lane = Lane()
+        return lane, await asyncio.gather(*(lane.acquire() for _ in range(50)))
+
+    lane, results = asyncio.run(burst())
+    assert results == [None] * 50
+    assert lane.max_queued == 0
@@ -0,0 +1,82 @@
+# test_providers.py
+import asyncio
+
+from providers import (
+    CachedProvider, DEFAULTS, DistrictSoilTable, EnvironmentalDataService,
+    EnvironmentalProvider, LocalRasterProvider, Reading, StubProvider,
+)
+
+
+class SlowProvider(EnvironmentalProvider):
+    """Answers every lookup, but only after `delay` seconds."""
+
+    def __init__(self, delay: float, value: float = 99.0):
+        self.delay = delay
+        self.value = value
+        self.calls = 0
+
+    async def nitrogen(self, lat, lon):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return Reading(self.value, "live")
+
+    async def ph(self, lat, lon):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return Reading(self.value, "live")
+
+
+def district_table(tmp_path):
+    path = tmp_path / "soil_data.csv"
+    path.write_text("DISTRICT,N,P,K,pH\nAgra,145,18,320,8.1\n")
+    return DistrictSoilTable(str(path))
+
+
+def test_slow_provider_falls_through_to_local_raster(tmp_path):
+    raster = tmp_path / "soil_raster.csv"
+    raster.write_text("lat,lon,nitrogen,ph\n27.18,78.01,55.0,7.9\n")
+    service = EnvironmentalDataService(
+        [SlowProvider(delay=10.0), LocalRasterProvider(str(raster))],
+        district_table(tmp_path), deadline=0.2,
+    )
+
+    env = asyncio.run(service.fetch(27.18, 78.01, "Agra"))
+    assert (env.nitrogen, env.sources["nitrogen"]) == (55.0, "local")
+    assert (env.ph, env.sources["ph"]) == (7.9, "local")
+
+
+def test_slow_provider_then_stub_tags_sources(tmp_path):
+    service = EnvironmentalDataService([SlowProvider(delay=10.0), StubProvider(nitrogen=12.0)],
+                                       district_table(tmp_path), deadline=0.05)
+
+    env = asyncio.run(service.fetch(27.18, 78.01, "Agra"))
+    assert (env.nitrogen, env.sources["nitrogen"]) == (12.0, "stub")
+    assert env.sources["ph"] == "stub"
+    assert env.sources["temperature"] == "stub"  # SlowProvider has no weather at all
+    assert (env.phosphorus, env.potassium) == (18.0, 320.0)
+    assert env.sources["phosphorus"] == env.sources["potassium"] == "local"
+
+
+def test_deadline_defaults_missing_values(tmp_path):
+    service = EnvironmentalDataService([SlowProvider(delay=10.0)], district_table(tmp_path), deadline=0.05)
+
+    env = asyncio.run(service.fetch(27.18, 78.01, "Unknown"))
+    assert (env.nitrogen, env.ph, env.phosphorus) == (DEFAULTS["nitrogen"], DEFAULTS["ph"], DEFAULTS["phosphorus"])
+    assert set(env.sources.values()) == {"default"}
+
+
+def test_cache_fill_lands_after_deadline(tmp_path):
+    slow = SlowProvider(delay=0.1, value=6.5)
+    cache = CachedProvider(slow)
+    service = EnvironmentalDataService([cache], district_table(tmp_path), deadline=0.05)
+
+    async def scenario():
+        first = await service.fetch(27.18, 78.01, "Agra")
+        await asyncio.sleep(0.15)  # the shielded upstream calls finish in the background
+        second = await service.fetch(27.18, 78.01, "Agra")
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first.sources["ph"] == "default"
+    assert (second.ph, second.sources["ph"]) == (6.5, "cached")
+    assert slow.calls == 2  # one nitrogen + one pH call, none repeated by the second request
@@ -0,0 +1,95 @@
+# test_warmer.py
+import asyncio
+
+from providers import CacheWarmer, CachedProvider, Reading, StubProvider, TileTracker
+
+
+class CountingProvider(StubProvider):
+    """Stub that logs every upstream call; pH can be made to always fail."""
+
+    def __init__(self, ph_fails: bool = False, delay: float = 0.0):
+        super().__init__()
+        self.ph_fails = ph_fails
+        self.delay = delay
+        self.calls = []
+
+    async def weather(self, lat, lon):
+        self.calls.append(("weather", (lat, lon)))
+        await asyncio.sleep(self.delay)
+        return await super().weather(lat, lon)
+
+    async def nitrogen(self, lat, lon):
+        self.calls.append(("nitrogen", (lat, lon)))
+        return await super().nitrogen(lat, lon)
+
+    async def ph(self, lat, lon):
+        self.calls.append(("ph", (lat, lon)))
+        if self.ph_fails:
+            raise RuntimeError("no soil data here")
+        return await super().ph(lat, lon)
+
+
+def hot_tracker(*tiles):
+    tracker = TileTracker()
+    for hits, (lat, lon) in enumerate(reversed(tiles), start=1):
+        for _ in range(hits):  # earlier tiles get more hits, so they rank hotter
+            tracker.record(lat, lon)
+    return tracker
+
+
+def test_weather_for_all_tiles_before_soil():
+    upstream = CountingProvider()
+    warmer = CacheWarmer(CachedProvider(upstream), hot_tracker((10.0, 10.0), (11.0, 11.0)), calls_per_minute=60)
+
+    calls = asyncio.run(warmer.warm_once())
+    assert calls == 6
+    assert [kind for kind, _ in upstream.calls[:2]] == ["weather", "weather"]
+    assert {kind for kind, _ in upstream.calls[2:]} == {"nitrogen", "ph"}
+
+
+def test_budget_exhaustion_stops_the_pass():
+    upstream = CountingProvider()
+    warmer = CacheWarmer(CachedProvider(upstream), hot_tracker((10.0, 10.0), (11.0, 11.0), (12.0, 12.0)),
+                         calls_per_minute=2)
+
+    assert asyncio.run(warmer.warm_once()) == 2
+    assert [kind for kind, _ in upstream.calls] == ["weather", "weather"]
+    assert warmer.budget_exhausted == 1
+
+
+def test_zero_budget_makes_no_calls():
+    upstream = CountingProvider()
+    warmer = CacheWarmer(CachedProvider(upstream), hot_tracker((10.0, 10.0)), calls_per_minute=0)
+
+    assert asyncio.run(warmer.warm_once()) == 0
+    assert upstream.calls == []
+
+
+def test_failed_soil_lookup_is_backed_off():
+    upstream = CountingProvider(ph_fails=True)
+    warmer = CacheWarmer(CachedProvider(upstream), hot_tracker((10.0, 10.0)), calls_per_minute=60)
+
+    async def two_passes():
+        return await warmer.warm_once(), await warmer.warm_once()
+
+    first, second = asyncio.run(two_passes())
+    assert first == 3   # weather, nitrogen, failing pH
+    assert second == 0  # everything cached or backed off
+    assert upstream.calls.count(("ph", (10.0, 10.0))) == 1
+    assert warmer.status()["soil_backoff_entries"] == 1
+
+
+def test_warmer_shares_in_flight_fetch_with_requests():
+    upstream = CountingProvider(delay=0.05)
+    cache = CachedProvider(upstream)
+    warmer = CacheWarmer(cache, hot_tracker((10.0, 10.0)), calls_per_minute=60)
+
+    async def scenario():
+        request = asyncio.create_task(cache.weather(10.0, 10.0))
+        await asyncio.sleep(0)  # the request's upstream call is now in flight
+        await warmer.warm_once()
+        return await request
+
+    reading = asyncio.run(scenario())
+    assert reading == Reading(reading.value, "stub")
+    assert upstream.calls.count(("weather", (10.0, 10.0))) == 1
@@ -1,10 +1,33 @@
 # train_model.py
+#
+# Usage:
+#   python train_model.py            -> trains the standard 100-tree model
+#   python train_model.py --sweep    -> tries smaller forests and saves the smallest one
+#                                       that meets --accuracy-floor and --latency-budget-ms
+
+import argparse
+import itertools
+import pickle
+import statistics
+import time
 
 import pandas as pd
+from joblib import Parallel, delayed
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score
-import pickle
+
+parser = argparse.ArgumentParser(description="Train the crop recommendation model.")
+parser.add_argument("--sweep", action="store_true",
+                    help="Sweep n_estimators/max_depth/min_samples_leaf and report accuracy, size and latency.")
+parser.add_argument("--accuracy-floor", type=float, default=0.99,
+                    help="Minimum test accuracy (0-1) a swept model needs to be saved.")
+parser.add_argument("--latency-budget-ms", type=float, default=10.0,
+                    help="Maximum single-row predict_proba latency (ms) a swept model may have.")
+parser.add_argument("--report", default="model_sweep_report.csv",
+                    help="Where to write the sweep results as CSV.")
+parser.add_argument("--output", default="crop_model.pkl", help="Where to save the chosen model.")
+args = parser.parse_args()
 
 # --- 1. Load the Dataset ---
 # Load the data from the CSV file into a pandas DataFrame.
@@ -22,29 +45,90 @@ y = df['label']
 # This helps us understand how well the model will perform on new, unseen data.
 X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
 
-# --- 4. Initialize and Train the Random Forest Model ---
-# We create an instance of the Random Forest Classifier.
-# n_estimators=100 means it will use 100 individual decision trees.
-model = RandomForestClassifier(n_estimators=100, random_state=42)
 
-# We train the model using our training data.
-print("Training the model...")
-model.fit(X_train, y_train)
-print("Model training complete.")
+def train_candidate(params):
+    """Trains one forest single-threaded; the sweep runs many of these in parallel."""
+    candidate = RandomForestClassifier(random_state=42, n_jobs=1, **params)
+    candidate.fit(X_train, y_train)
+    return params, candidate
+
+
+def median_ms(fn, repeats):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def measure(params, candidate):
+    """Accuracy, pickled size, load time and prediction latency for one model."""
+    blob = pickle.dumps(candidate)
+    single_row = X_test.iloc[[0]]  # the API predicts one location at a time
+    return {
+        **params,
+        "accuracy": accuracy_score(y_test, candidate.predict(X_test)),
+        "size_kb": len(blob) / 1024,
+        "load_ms": median_ms(lambda: pickle.loads(blob), 5),
+        "single_row_ms": median_ms(lambda: candidate.predict_proba(single_row), 50),
+        "batch_ms": median_ms(lambda: candidate.predict_proba(X_test), 5),
+    }
+
+
+if not args.sweep:
+    # --- 4. Initialize and Train the Random Forest Model ---
+    # We create an instance of the Random Forest Classifier.
+    # n_estimators=100 means it will use 100 individual decision trees.
+    model = RandomForestClassifier(n_estimators=100, random_state=42)
+
+    # We train the model using our training data.
+    print("Training the model...")
+    model.fit(X_train, y_train)
+    print("Model training complete.")
+
+    # --- 5. Evaluate the Model's Performance ---
+    # We make predictions on the test set.
+    y_pred = model.predict(X_test)
+
+    # We calculate the accuracy by comparing the model's predictions to the actual labels.
+    accuracy = accuracy_score(y_test, y_pred)
+    print(f"Model Accuracy on the test set: {accuracy * 100:.2f}%")
+else:
+    # --- 4. Train Every Candidate in Parallel (all cores) ---
+    grid = {
+        "n_estimators": [10, 25, 50, 100],
+        "max_depth": [None, 8, 12, 16],
+        "min_samples_leaf": [1, 2, 4],
+    }
+    candidates = [dict(zip(grid, values)) for values in itertools.product(*grid.values())]
+    print(f"Training {len(candidates)} candidate models on all cores...")
+    trained = Parallel(n_jobs=-1)(delayed(train_candidate)(params) for params in candidates)
 
-# --- 5. Evaluate the Model's Performance ---
-# We make predictions on the test set.
-y_pred = model.predict(X_test)
+    # --- 5. Measure Each Candidate ---
+    # Timing runs one model at a time so the numbers aren't skewed by other workers.
+    results = pd.DataFrame([measure(params, candidate) for params, candidate in trained])
+    results.to_csv(args.report, index=False)
+    print(results.sort_values("size_kb").to_string(index=False, float_format="%.3f"))
+    print(f"\nFull report written to '{args.report}'")
 
-# We calculate the accuracy by comparing the model's predictions to the actual labels.
-accuracy = accuracy_score(y_test, y_pred)
-print(f"Model Accuracy on the test set: {accuracy * 100:.2f}%")
+    # --- 6. Pick the Smallest Model Within the Accuracy Floor and Latency Budget ---
+    eligible = results[(results["accuracy"] >= args.accuracy_floor) &
+                       (results["single_row_ms"] <= args.latency_budget_ms)]
+    if eligible.empty:
+        raise SystemExit(f"No candidate reached {args.accuracy_floor * 100:.2f}% accuracy within "
+                         f"{args.latency_budget_ms} ms per row. Nothing was saved.")
+    best = eligible.sort_values(["size_kb", "accuracy"], ascending=[True, False]).index[0]
+    params, model = trained[best]
+    row = results.loc[best]
+    print(f"\nChosen model: {params} -> accuracy {row['accuracy'] * 100:.2f}%, "
+          f"{row['size_kb']:.1f} KB, {row['single_row_ms']:.2f} ms per row")
 
-# --- 6. Save the Trained Model ---
+# --- 7. Save the Trained Model ---
 # Finally, we save the trained model to a file using pickle.
 # The 'wb' means we are writing in binary mode.
-with open('crop_model.pkl', 'wb') as model_file:
+with open(args.output, 'wb') as model_file:
     pickle.dump(model, model_file)
 
-print("\nModel saved successfully as 'crop_model.pkl'")
-print("This file is now ready to be used by your FastAPI backend.")
\ No newline at end of file
+print(f"\nModel saved successfully as '{args.output}'")
+print("This file is now ready to be used by your FastAPI backend.")